@@ -1,15 +1,16 @@
+import math
 import os
 import sys
 
 from PyQt5.QtCore import Qt, QSize
 from PyQt5.QtGui import QIcon, QPixmap
 from PyQt5.QtWidgets import QApplication, QMainWindow, QVBoxLayout, QWidget, QLabel, QPushButton, QComboBox, \
-    QHBoxLayout, QSizePolicy, QMessageBox, QFrame, QGroupBox, QGridLayout
+    QHBoxLayout, QSizePolicy, QMessageBox, QFrame, QGroupBox, QGridLayout, QDialog
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
 
-from data_handling import scrape_data, organize_data_files, get_prediction
-from data_handling import load_data, get_pick_rate, get_win_rate
+from data_handling import scrape_data, organize_data_files, get_prediction, SCRAPE_RANKS, SCRAPE_MAPS, COMPETITIVE_RANKS
+from data_handling import load_data, get_pick_rate, get_win_rate, sweep_predictions, AGENTS
 
 EXECUTABLE_DIRECTORY = sys._MEIPASS
 
@@ -21,15 +22,11 @@ class MainWindow(QApplication):
     BUTTON_STYLESHEET = "background-color: {}; color: white; font-size: 16px; padding: 10px; border-radius: 5px;"
     BUTTON_FIXED_POLICY = QSizePolicy(QSizePolicy.Fixed, QSizePolicy.Fixed)
 
-    AGENT_OPTIONS = sorted(
-        ['Gekko', 'Deadlock', 'Brimstone', 'Phoenix', 'Sage', 'Sova', 'Viper', 'Cypher', 'Reyna',
-         'Killjoy', 'Breach', 'Omen', 'Jett', 'Raze', 'Skye', 'Yoru', 'Astra', 'KAY/O', 'Chamber',
-         'Neon', 'Fade', 'Harbor'])
+    AGENT_OPTIONS = sorted(AGENTS)
 
-    RANK_CATEGORIES = sorted(
-        ["Iron", "Bronze", "Silver", "Gold", "Platinum", "Diamond", "Ascendant", "Immortal", "Radiant"])
+    RANK_CATEGORIES = sorted(COMPETITIVE_RANKS)
 
-    RANKED_MAPS = sorted(["Split", "Ascent", "Haven", "Bind", "Fracture", "Pearl", "Lotus"])
+    RANKED_MAPS = sorted(SCRAPE_MAPS)
 
     def __init__(self, argv):
         super().__init__(argv)
@@ -216,12 +213,14 @@ class MainWindow(QApplication):
         self.download_button = self.add_button('Download Latest Match Data ', '#007BFF',
                                                self.on_download_data_button_click)
         self.predict_button = self.add_button('Make a Prediction', '#007BFF', self.on_make_prediction_button_click)
+        self.sweep_button = self.add_button('Predict Every Rank and Map', '#007BFF', self.on_sweep_button_click)
         self.exit_button = self.add_button('Exit Application', '#6C757D', self.exit_program)
 
-        self.button_layout.setSpacing(525)
+        self.button_layout.setSpacing(350)
         self.button_layout.addStretch()
         self.button_layout.addWidget(self.download_button)
         self.button_layout.addWidget(self.predict_button)
+        self.button_layout.addWidget(self.sweep_button)
         self.button_layout.addWidget(self.exit_button)
         self.button_layout.addStretch()
 
@@ -325,31 +324,25 @@ class MainWindow(QApplication):
 
     # Scrapes and organizes match data for each rank on each map
     def on_download_data_button_click(self):
-        ranks_iron = [(3, "Iron 1"), (4, "Iron 2"), (5, "Iron 3")]
-        ranks_bronze = [(6, "Bronze 1"), (7, "Bronze 2"), (8, "Bronze 3")]
-        ranks_silver = [(9, "Silver 1"), (10, "Silver 2"), (11, "Silver 3")]
-        ranks_gold = [(12, "Gold 1"), (13, "Gold 2"), (14, "Gold 3")]
-        ranks_platinum = [(15, "Platinum 1"), (16, "Platinum 2"), (17, "Platinum 3")]
-        ranks_diamond = [(18, "Diamond 1"), (19, "Diamond 2"), (20, "Diamond 3")]
-        ranks_ascendant = [(21, "Ascendant 1"), (22, "Ascendant 2"), (23, "Ascendant 3")]
-        ranks_immortal = [(24, "Immortal 1"), (25, "Immortal 2"), (26, "Immortal 3")]
-        ranks_radiant = [(27, "Radiant")]
-        ranked_maps = ["Split", "Ascent", "Haven", "Bind", "Fracture", "Pearl", "Lotus"]
-
         self.download_button.setDisabled(True)
 
         QMessageBox.information(self.main_window, "Information",
                                 "Downloading the newest competitive match data! This can take a few minutes...")
 
         try:
-            scrape_data(ranks_iron + ranks_bronze + ranks_silver + ranks_gold + ranks_platinum + ranks_diamond +
-                        ranks_ascendant + ranks_immortal + ranks_radiant, ranked_maps)
+            failed_pages = scrape_data(SCRAPE_RANKS, SCRAPE_MAPS)
 
             organize_data_files(os.path.join(EXECUTABLE_DIRECTORY, "..", ".."))
 
             self.download_button.setDisabled(False)
-            QMessageBox.information(self.main_window, "Information", "The newest available competitive match data has "
-                                                                     "completed downloading.")
+            if failed_pages:
+                QMessageBox.warning(self.main_window, "Warning", f"The match data for {len(failed_pages)} rank/map "
+                                                                 f"pages could not be downloaded: "
+                                                                 f"{', '.join(failed_pages)}. Their previously "
+                                                                 f"downloaded data was kept.")
+            else:
+                QMessageBox.information(self.main_window, "Information", "The newest available competitive match data "
+                                                                         "has completed downloading.")
 
         except Exception as e:
             QMessageBox.critical(self.main_window, "Error", f"An error occurred: {str(e)}")
@@ -377,6 +370,58 @@ class MainWindow(QApplication):
         except Exception as e:
             self.show_error_message(str(e))
 
+    # Predicts the selected lineup on every rank and map at once and displays the win chances as a heatmap
+    def on_sweep_button_click(self):
+        try:
+            team1_agents, team2_agents, _, _ = self.get_inputs()
+            self.validate_agents(team1_agents, team2_agents)
+
+            # The first sweep fits a model for every rank and map, which blocks the window for a few seconds
+            QApplication.setOverrideCursor(Qt.WaitCursor)
+            try:
+                probability_grid = sweep_predictions(COMPETITIVE_RANKS, self.RANKED_MAPS, team1_agents, team2_agents)
+            finally:
+                QApplication.restoreOverrideCursor()
+
+            self.show_sweep_heatmap(probability_grid)
+
+        except Exception as e:
+            self.show_error_message(str(e))
+
+    # Displays Team 1's win chance for every rank and map as a single heatmap in a separate window
+    def show_sweep_heatmap(self, probability_grid):
+        dialog = QDialog(self.main_window)
+        dialog.setWindowTitle("Team 1 Win Chances by Rank and Map")
+        dialog_layout = QVBoxLayout(dialog)
+
+        figure = Figure(figsize=(9, 7))
+        canvas = FigureCanvas(figure)
+        dialog_layout.addWidget(canvas)
+
+        ax = figure.add_subplot(111)
+        heatmap = ax.imshow(probability_grid.values, cmap='RdBu', vmin=0, vmax=100, aspect='auto')
+
+        # Rank/map pairs without a reliable prediction are NaN, which are left blank and labelled as n/a
+        for row, rank in enumerate(probability_grid.index):
+            for column, map_name in enumerate(probability_grid.columns):
+                probability = probability_grid.loc[rank, map_name]
+                label = "n/a" if math.isnan(probability) else f"{probability:.1f}%"
+                ax.text(column, row, label, ha='center', va='center', fontsize=9)
+
+        ax.set_title('Team 1 Win Chances', fontsize=16, fontweight='bold')
+        ax.set_xticks(range(len(probability_grid.columns)))
+        ax.set_xticklabels(probability_grid.columns, rotation=45, ha='right')
+        ax.set_yticks(range(len(probability_grid.index)))
+        ax.set_yticklabels(probability_grid.index)
+        ax.set_xlabel('Map', fontsize=12)
+        ax.set_ylabel('Rank', fontsize=12)
+        figure.colorbar(heatmap, ax=ax, label='Win Chance (%)')
+        figure.tight_layout()
+
+        canvas.draw_idle()
+        dialog.resize(900, 700)
+        dialog.exec_()
+
     # Gets the inputs for agents selected on each team, the rank, and the map
     def get_inputs(self):
         team1_agents = [box.currentText() for box in self.team1_boxes if box.currentText() != ""]
@@ -391,6 +436,10 @@ class MainWindow(QApplication):
             raise ValueError("Please select a rank.")
         if not map_name:
             raise ValueError("Please select a map.")
+        MainWindow.validate_agents(team1_agents, team2_agents)
+
+    @staticmethod
+    def validate_agents(team1_agents, team2_agents):
         if len(team1_agents) < 5 or len(team2_agents) < 5:
             raise ValueError("Please select all 5 agents for both Team 1 and Team 2.")
 
@@ -3,8 +3,11 @@ import os
 import re
 import shutil
 import sys
+import time
+from functools import reduce
 from typing import List, Tuple
 
+import numpy as np
 import pandas as pd
 import requests
 from bs4 import BeautifulSoup
@@ -14,7 +17,49 @@ from sklearn.metrics import accuracy_score
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler
 
-EXECUTABLE_DIRECTORY = sys._MEIPASS
+# Falls back to the location of the bundled executable so the module can also be used from a source checkout
+EXECUTABLE_DIRECTORY = getattr(sys, '_MEIPASS',
+                               os.path.join(os.path.dirname(os.path.abspath(__file__)), "dist", "main"))
+
+# Fitted matches-weighted models keyed by (rank, map), reused until one of the underlying tier files changes
+WEIGHTED_MODEL_CACHE = {}
+
+# Per-agent weighted sums of each tier file, reused until the file changes
+TIER_SUMS_CACHE = {}
+
+# Regularisation strengths tried for the matches-weighted model, from the strongest to the weakest regularisation
+REGULARIZATION_STRENGTHS = [0.1, 1.0, 10.0, 100.0]
+
+# Number of rows held in memory at once by the chunked data handling functions
+CHUNK_SIZE = 50000
+
+STAT_COLUMNS = ['Kills', 'Deaths', 'Assists', 'Win %', 'Pick %', 'Avg. Score', 'First Blood %']
+
+# Every playable agent
+AGENTS = ['Gekko', 'Deadlock', 'Brimstone', 'Phoenix', 'Sage', 'Sova', 'Viper', 'Cypher', 'Reyna', 'Killjoy', 'Breach',
+          'Omen', 'Jett', 'Raze', 'Skye', 'Yoru', 'Astra', 'KAY/O', 'Chamber', 'Neon', 'Fade', 'Harbor']
+
+# Every (rank number, rank name) tier and map that is downloaded from blitz.gg
+SCRAPE_RANKS = [(3, "Iron 1"), (4, "Iron 2"), (5, "Iron 3"), (6, "Bronze 1"), (7, "Bronze 2"), (8, "Bronze 3"),
+                (9, "Silver 1"), (10, "Silver 2"), (11, "Silver 3"), (12, "Gold 1"), (13, "Gold 2"), (14, "Gold 3"),
+                (15, "Platinum 1"), (16, "Platinum 2"), (17, "Platinum 3"), (18, "Diamond 1"), (19, "Diamond 2"),
+                (20, "Diamond 3"), (21, "Ascendant 1"), (22, "Ascendant 2"), (23, "Ascendant 3"), (24, "Immortal 1"),
+                (25, "Immortal 2"), (26, "Immortal 3"), (27, "Radiant")]
+SCRAPE_MAPS = ["Split", "Ascent", "Haven", "Bind", "Fracture", "Pearl", "Lotus"]
+
+# Every rank category, ordered from the lowest to the highest tier
+COMPETITIVE_RANKS = ["Iron", "Bronze", "Silver", "Gold", "Platinum", "Diamond", "Ascendant", "Immortal", "Radiant"]
+
+# Selects the agent rows of the blitz.gg stats table. The hashed class names change whenever blitz.gg redeploys
+ROW_SELECTOR = '#main-content > div > div.⚡de27659b.inner-wrapper-col > div > div:nth-child(4) > section > ' \
+               'div > div.⚡e728021b.⚡197afe09 > div > div.⚡516a5f38 > div > div'
+
+# Number of times a failed request is retried, and the delay before the first retry which doubles on each attempt
+MAX_RETRIES = 3
+RETRY_DELAY = 1.0
+
+# Seconds to wait for blitz.gg to connect or send data before a request times out
+REQUEST_TIMEOUT = 30
 
 
 # Creates a new directory if it does not already exist
@@ -38,31 +83,68 @@ def concat_files(files: List[str], output_file: str) -> None:
     concated_data.to_csv(output_file, index=False)
 
 
+# Concatenates files into a new file one chunk at a time, so only a single chunk is ever held in memory
+def concat_files_chunked(files: List[str], output_file: str, chunksize: int = CHUNK_SIZE) -> None:
+    if os.path.exists(output_file):
+        os.remove(output_file)
+
+    write_header = True
+    for file in files:
+        for chunk in pd.read_csv(file, delimiter=',', chunksize=chunksize):
+            chunk.to_csv(output_file, mode='a', header=write_header, index=False)
+            write_header = False
+
+
+# Gets compact column types for streaming data files: categorical agents and float32 stats
+# When agents are given they are the fixed categories of every chunk, so every chunk has the same encoding
+def get_compact_dtypes(agents=None):
+    agent_dtype = pd.CategoricalDtype(sorted(set(agents))) if agents is not None else 'category'
+    return {'Agent': agent_dtype, 'Matches': str, **{column: 'float32' for column in STAT_COLUMNS}}
+
+
+# Streams a data file in chunks of compact dtypes. When agents are given, the rows of any other agent are dropped as
+# soon as each chunk is read, otherwise every agent in the file is kept. Chunks without any rows are skipped
+def read_filtered_chunks(data_file, agents=None, chunksize=CHUNK_SIZE):
+    columns = ['Agent'] + STAT_COLUMNS + ['Matches']
+    compact_dtypes = get_compact_dtypes(agents)
+    agent_dtype = compact_dtypes['Agent']
+
+    for chunk in pd.read_csv(data_file, usecols=columns, dtype={**compact_dtypes, 'Agent': 'category'},
+                             chunksize=chunksize):
+        if agents is not None:
+            chunk = chunk[chunk['Agent'].isin(agent_dtype.categories)].copy()
+            chunk['Agent'] = chunk['Agent'].astype(agent_dtype)
+        if chunk.empty:
+            continue
+        chunk['Matches'] = chunk['Matches'].str.extract(r'(\d+)', expand=False).astype('int32')
+        yield chunk
+
+
 # Organizes the data files into a structure based on each rank and map
+# The combined file of each rank/map is rebuilt from all of its tier files, so a tier that was not downloaded again
+# keeps its previous data
 def organize_data_files(file_directory):
     target_directory = os.path.join(file_directory, "CompetitiveData")
     create_directory(target_directory)
 
-    competitive_ranks = ["Iron", "Bronze", "Silver", "Gold", "Platinum", "Diamond", "Ascendant", "Immortal", "Radiant"]
-    competitive_maps = ["Ascent", "Bind", "Haven", "Split", "Fracture", "Pearl", "Lotus"]
-
-    for rank in competitive_ranks:
+    for rank in COMPETITIVE_RANKS:
         rank_category_directory = os.path.join(target_directory, rank)
         create_directory(rank_category_directory)
 
-        for map in competitive_maps:
+        for map in SCRAPE_MAPS:
             map_directory = os.path.join(rank_category_directory, map)
             create_directory(map_directory)
 
             pattern = re.compile(f'{rank.lower()}[0-9]*?_{map.lower()}.csv')
             source_files = [os.path.join(file_directory, file) for file in os.listdir(file_directory) if
                             pattern.match(file)]
-            target_files = [os.path.join(map_directory, os.path.basename(file)) for file in source_files]
 
             move_and_delete_files(source_files, map_directory)
 
-            combined_data_file = os.path.join(map_directory, f"{rank}_{map}_CombinedData.csv")
-            concat_files(target_files, combined_data_file)
+            tier_files = get_tier_files(map_directory, rank, map)
+            if tier_files:
+                combined_data_file = os.path.join(map_directory, f"{rank}_{map}_CombinedData.csv")
+                concat_files_chunked(tier_files, combined_data_file)
 
 
 # Constructs the URL for scraping blitz.gg data for each rank and map
@@ -71,10 +153,34 @@ def construct_url(rank_number: str, map_name: str) -> str:
            f"=competitive&rank={rank_number}&map={map_name.lower()}"
 
 
-# Parses the HTML from blitz.gg
-def parse_html(url: str) -> BeautifulSoup:
-    response = requests.get(url)
-    return BeautifulSoup(response.content, "html.parser")
+# Downloads the raw HTML from blitz.gg
+def fetch_html(url: str) -> bytes:
+    response = requests.get(url, timeout=REQUEST_TIMEOUT)
+    response.raise_for_status()
+    return response.content
+
+
+# Checks whether a failed request may succeed when retried: connection errors, timeouts and 5xx server errors
+def is_retryable(error: requests.RequestException) -> bool:
+    if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+        return True
+    return isinstance(error, requests.HTTPError) and error.response is not None and error.response.status_code >= 500
+
+
+# Parses the HTML from blitz.gg, retrying transient failures with exponential backoff
+# A different fetch function can be passed in, e.g. to replay recorded responses
+def parse_html(url: str, fetch=fetch_html, retries: int = MAX_RETRIES,
+               retry_delay: float = RETRY_DELAY) -> BeautifulSoup:
+    for attempt in range(retries + 1):
+        try:
+            content = fetch(url)
+            break
+        except requests.RequestException as error:
+            if attempt == retries or not is_retryable(error):
+                raise
+            time.sleep(retry_delay * 2 ** attempt)
+
+    return BeautifulSoup(content, "html.parser")
 
 
 # Extracts specific data from each row of a blitz.gg URL
@@ -104,24 +210,34 @@ def write_to_csv(file_path: str, header: List[str], rows: List[List[str]]):
         writer.writerows(rows)
 
 
+# Scrapes and extracts the agent rows from blitz.gg for a single rank and map
+def scrape_rows(rank_number: str, map_name: str, fetch=fetch_html, retry_delay: float = RETRY_DELAY) -> List[List[str]]:
+    url = construct_url(rank_number, map_name)
+    soup = parse_html(url, fetch, retry_delay=retry_delay)
+    rows = soup.select(ROW_SELECTOR)
+    return [extract_row_data(row) for row in rows]
+
+
 # Scrapes data from blitz.gg for each rank and map
-def scrape_data(ranks: List[Tuple[str, str]], maps: List[str]):
+# A page that cannot be downloaded is not written, so the data of its previous download is kept, and the download
+# carries on with the remaining pages. Returns the rank and map of every page that failed
+def scrape_data(ranks: List[Tuple[str, str]], maps: List[str], fetch=fetch_html) -> List[str]:
+    failed_pages = []
     for rank_number, rank_name in ranks:
         for map in maps:
-            url = construct_url(rank_number, map)
-            soup = parse_html(url)
-
-            selector = '#main-content > div > div.⚡de27659b.inner-wrapper-col > div > div:nth-child(4) > section > ' \
-                       'div > div.⚡e728021b.⚡197afe09 > div > div.⚡516a5f38 > div > div'
-            rows = soup.select(selector)
-
             csv_file = f"{rank_name.lower().replace(' ', '')}_{map.lower()}.csv"
             header = ["Rank", "Agent", "Kills", "Deaths", "Assists", "Win %", "Pick %", "Avg. Score", "First Blood %",
                       "Matches"]
 
-            data_rows = [extract_row_data(row) for row in rows]
+            try:
+                data_rows = scrape_rows(rank_number, map, fetch)
+            except requests.RequestException:
+                failed_pages.append(f"{rank_name} on {map}")
+                continue
             write_to_csv(csv_file, header, data_rows)
 
+    return failed_pages
+
 
 # Loads the specified rank and map data from the corresponding CSV
 def load_data(rank, map_name, file_directory):
@@ -144,18 +260,48 @@ def load_and_filter_data(rank, map_name, team1_agents, team2_agents):
     return filtered_data
 
 
+# Loads the specified rank and map data in chunks, filtering each chunk to the selected agents as it is read
+# Yields the filtered chunks one at a time so they can be passed straight to preprocess_data_chunked
+def load_and_filter_data_chunked(rank, map_name, team1_agents, team2_agents, chunksize=CHUNK_SIZE):
+    data_directory = os.path.join(EXECUTABLE_DIRECTORY, "..", "..", "CompetitiveData")
+    combined_data_file = os.path.join(data_directory, rank, map_name, f"{rank}_{map_name}_CombinedData.csv")
+
+    selected_agents = team1_agents + team2_agents
+    yield from read_filtered_chunks(combined_data_file, selected_agents, chunksize)
+
+
 # Filters data by selecting specific features and performs one hot encoding
 def preprocess_data(filtered_data):
     features = filtered_data[
-        ['Agent', 'Kills', 'Deaths', 'Assists', 'Win %', 'Pick %', 'Avg. Score', 'First Blood %', 'Matches']]
+        ['Agent', 'Kills', 'Deaths', 'Assists', 'Win %', 'Pick %', 'Avg. Score', 'First Blood %', 'Matches']].copy()
 
-    features.loc[:, 'Matches'] = features['Matches'].astype(str).str.extract(r'(\d+)', expand=False).astype(int)
+    features['Matches'] = features['Matches'].astype(str).str.extract(r'(\d+)', expand=False).astype(int)
 
     processed_data = pd.get_dummies(features, columns=['Agent'])
 
     return processed_data
 
 
+# Performs the same preprocessing as preprocess_data one chunk at a time, keeping the stats as float32 and
+# matches as int32. Only the processed rows are held in memory, never the whole data file, so it is meant for
+# chunks that are already filtered to the selected agents. An agent missing from some chunks gets False in them
+def preprocess_data_chunked(filtered_chunks):
+    processed_chunks = []
+    for chunk in filtered_chunks:
+        features = chunk[['Agent'] + STAT_COLUMNS + ['Matches']].copy()
+        features['Matches'] = features['Matches'].astype(str).str.extract(r'(\d+)', expand=False).astype('int32')
+        processed_chunks.append(pd.get_dummies(features, columns=['Agent']))
+
+    if not processed_chunks:
+        raise ValueError("No match data found for the selected agents.")
+
+    processed_data = pd.concat(processed_chunks, ignore_index=True)
+    agent_columns = sorted(column for column in processed_data.columns if column.startswith('Agent_'))
+    processed_data[agent_columns] = processed_data[agent_columns].fillna(False).astype(bool)
+
+    return processed_data[STAT_COLUMNS + ['Matches'] + agent_columns]
+
+
 # Splits data into training and test sets and scales the data
 def train_test_split_and_scaling(processed_data):
     X = processed_data.drop('Win %', axis=1)
@@ -188,8 +334,221 @@ def fit_model(X_train_imputed_scaled, y_train, X_test_imputed_scaled, y_test):
     return model, accuracy
 
 
-# Predicts the winning team and returns the result as a string
-def predict_winner(model, team1_agents, team2_agents, feature_names):
+# Sums the stats of each agent weighted by matches played, along with the total matches of each agent
+def sum_weighted_stats(data):
+    weighted_data = data[['Agent'] + STAT_COLUMNS].copy()
+    weighted_data['Matches'] = data['Matches'].astype(str).str.extract(r'(\d+)', expand=False).astype('int64')
+    weighted_data[STAT_COLUMNS] = weighted_data[STAT_COLUMNS].apply(pd.to_numeric, errors='coerce').astype(
+        'float64').mul(weighted_data['Matches'], axis=0)
+
+    return weighted_data.groupby('Agent', sort=True, observed=True).sum()
+
+
+# Turns the weighted sums of each agent into matches-weighted averages
+def average_weighted_stats(weighted_sums):
+    aggregated_data = weighted_sums.copy()
+    aggregated_data['Matches'] = aggregated_data['Matches'].astype('int64')
+    aggregated_data[STAT_COLUMNS] = aggregated_data[STAT_COLUMNS].div(aggregated_data['Matches'], axis=0)
+    aggregated_data.index = aggregated_data.index.astype(str)
+
+    return aggregated_data.reset_index()
+
+
+# Collapses the tier rows of each agent (e.g. Gold 1/2/3) into a single sample, averaging each stat weighted by matches
+# Holds all the data in memory; kept as the reference implementation for aggregate_tier_data_chunked
+def aggregate_tier_data(data):
+    return average_weighted_stats(sum_weighted_stats(data))
+
+
+# Streams a data file and sums the weighted stats of each agent like sum_weighted_stats, holding only one chunk and
+# the running per-agent sums in memory. Returns None when the file has no rows
+def sum_weighted_stats_chunked(data_file, chunksize=CHUNK_SIZE):
+    weighted_sums = None
+    for chunk in read_filtered_chunks(data_file, chunksize=chunksize):
+        chunk_sums = sum_weighted_stats(chunk)
+        weighted_sums = chunk_sums if weighted_sums is None else weighted_sums.add(chunk_sums, fill_value=0)
+
+    return weighted_sums
+
+
+# Streams a data file and collapses its tier rows like aggregate_tier_data
+def aggregate_tier_data_chunked(data_file, chunksize=CHUNK_SIZE):
+    weighted_sums = sum_weighted_stats_chunked(data_file, chunksize)
+    if weighted_sums is None:
+        raise ValueError(f"No match data found in {data_file}.")
+
+    return average_weighted_stats(weighted_sums)
+
+
+# Lists the tier data files of the rank/map, e.g. gold1_ascent.csv, gold2_ascent.csv and gold3_ascent.csv
+def get_tier_files(map_directory, rank, map_name):
+    pattern = re.compile(f'{rank.lower()}[0-9]*?_{map_name.lower()}.csv')
+    return sorted(os.path.join(map_directory, file) for file in os.listdir(map_directory) if pattern.match(file))
+
+
+# Returns the per-agent weighted sums of a tier file, only reading the file again when it changed
+def get_tier_sums(tier_file):
+    modified_time = os.path.getmtime(tier_file)
+
+    cached_sums = TIER_SUMS_CACHE.get(tier_file)
+    if cached_sums is None or cached_sums['modified_time'] != modified_time:
+        cached_sums = {'modified_time': modified_time, 'weighted_sums': sum_weighted_stats_chunked(tier_file)}
+        TIER_SUMS_CACHE[tier_file] = cached_sums
+
+    return cached_sums['weighted_sums']
+
+
+# Adds up the per-agent weighted sums of several tiers
+def add_weighted_sums(weighted_sums_list):
+    return reduce(lambda total, weighted_sums: total.add(weighted_sums, fill_value=0), weighted_sums_list)
+
+
+# Builds the samples of the matches-weighted model from per-agent weighted sums: a one hot encoding of each agent,
+# whether the agent wins at least half of its matches, and the number of matches the agent played
+def create_weighted_samples(weighted_sums, agents):
+    aggregated_data = average_weighted_stats(weighted_sums)
+    aggregated_data = aggregated_data[aggregated_data['Agent'].isin(agents)]
+
+    X = pd.get_dummies(pd.Categorical(aggregated_data['Agent'], categories=agents)).values.astype(float)
+    y = (aggregated_data['Win %'] >= 0.5).astype(int).values
+    matches = aggregated_data['Matches'].values.astype(float)
+
+    return X, y, matches
+
+
+# Creates a new regression model. When a previous model is given, its coefficients are copied over so the solver
+# warm starts from them, without modifying the previous model itself
+def create_weighted_model(regularization, previous_model=None):
+    model = LogisticRegression(C=regularization, max_iter=10000, warm_start=True)
+    if previous_model is not None:
+        model.coef_ = previous_model.coef_.copy()
+        model.intercept_ = previous_model.intercept_.copy()
+    return model
+
+
+# Splits the tiers into held out folds: each fold trains on the samples of the other tiers and is tested on the
+# samples of the tier left out
+def create_held_out_folds(tier_sums, agents):
+    folds = []
+    for held_out_file, held_out_sums in tier_sums:
+        training_sums = add_weighted_sums([weighted_sums for tier_file, weighted_sums in tier_sums
+                                           if tier_file != held_out_file])
+        folds.append((held_out_file, create_weighted_samples(training_sums, agents),
+                      create_weighted_samples(held_out_sums, agents)))
+    return folds
+
+
+# Scores the matches-weighted model on held out folds: the model is fitted on the other tiers and predicts which
+# agents win at least half of their matches in the left out tier, weighted by matches. The same is done for always
+# predicting the most common outcome of the other tiers, as the baseline the model has to beat.
+# Each fold warm starts from its own model of the previous fit, and the new fold models are added to fold_models
+def score_weighted_model(folds, regularization, previous_fold_models, fold_models):
+    correct = baseline_correct = total_matches = 0.0
+    for held_out_file, (X_train, y_train, train_matches), (X_test, y_test, test_matches) in folds:
+        most_common_outcome = int(np.average(y_train, weights=train_matches) >= 0.5)
+        baseline_pred = np.full(len(y_test), most_common_outcome)
+
+        if len(np.unique(y_train)) < 2:
+            y_pred = baseline_pred
+        else:
+            fold_key = (held_out_file, regularization)
+            fold_model = create_weighted_model(regularization, previous_fold_models.get(fold_key))
+            fold_model.fit(X_train, y_train, sample_weight=train_matches / train_matches.mean())
+            fold_models[fold_key] = fold_model
+            y_pred = fold_model.predict(X_test)
+
+        correct += test_matches[y_pred == y_test].sum()
+        baseline_correct += test_matches[baseline_pred == y_test].sum()
+        total_matches += test_matches.sum()
+
+    return correct / total_matches, baseline_correct / total_matches
+
+
+# Fits the matches-weighted model on every tier of a rank/map. Each agent is one sample whose stats are averaged by
+# matches played, weighted by its matches normalised to a mean of 1, and the only features are the agents themselves,
+# exactly as they are used for predictions. The regularisation strength with the best held out tier accuracy is used.
+# With a single tier there is nothing to hold out, so no accuracy is returned. When the tier data has not changed since
+# the previous fit, its scores are passed in as previous_scores and the held out tiers are not scored again
+def fit_weighted_model(tier_sums, agents, previous_model=None, previous_fold_models=None, previous_scores=None):
+    previous_fold_models = previous_fold_models or {}
+    fold_models = {}
+
+    regularization = 1.0
+    accuracy = baseline_accuracy = None
+    if previous_scores is not None:
+        regularization, accuracy, baseline_accuracy = previous_scores
+        fold_models = previous_fold_models
+    elif len(tier_sums) >= 2:
+        folds = create_held_out_folds(tier_sums, agents)
+        scores = {strength: score_weighted_model(folds, strength, previous_fold_models, fold_models)
+                  for strength in REGULARIZATION_STRENGTHS}
+        regularization = max(REGULARIZATION_STRENGTHS, key=lambda strength: scores[strength][0])
+        accuracy, baseline_accuracy = scores[regularization]
+
+    X, y, matches = create_weighted_samples(add_weighted_sums([weighted_sums for _, weighted_sums in tier_sums]),
+                                            agents)
+    if len(np.unique(y)) < 2:
+        raise ValueError("Every agent is on the same side of a 50% win rate, so no model can be fitted.")
+
+    if previous_model is not None and previous_model.C != regularization:
+        previous_model = None
+    model = create_weighted_model(regularization, previous_model)
+    model.fit(X, y, sample_weight=matches / matches.mean())
+
+    return model, accuracy, baseline_accuracy, fold_models
+
+
+# Gets the tier data files of the rank/map along with when each of them was last modified
+def get_tier_data_signature(rank, map_name):
+    map_directory = os.path.join(EXECUTABLE_DIRECTORY, "..", "..", "CompetitiveData", rank, map_name)
+    return [(tier_file, os.path.getmtime(tier_file)) for tier_file in get_tier_files(map_directory, rank, map_name)]
+
+
+# Returns the cached matches-weighted model for the rank/map, refitting it only when one of its tier files changed
+def get_weighted_model(rank, map_name):
+    cached_model = WEIGHTED_MODEL_CACHE.get((rank, map_name))
+    if cached_model is not None and cached_model['data_signature'] == get_tier_data_signature(rank, map_name):
+        return (cached_model['model'], cached_model['accuracy'], cached_model['baseline_accuracy'],
+                cached_model['feature_names'])
+
+    return refit_weighted_model(rank, map_name)
+
+
+# Refits the matches-weighted model of a single rank/map. Only the tier files that changed are read again, and when
+# the agent pool is unchanged the final model and every fold warm start from their cached models. Unchanged tier
+# data reuses the cached held out scores. The cache entry is only replaced once the fit has succeeded
+def refit_weighted_model(rank, map_name):
+    data_signature = get_tier_data_signature(rank, map_name)
+
+    tier_sums = [(tier_file, get_tier_sums(tier_file)) for tier_file, _ in data_signature]
+    tier_sums = [(tier_file, weighted_sums) for tier_file, weighted_sums in tier_sums
+                 if weighted_sums is not None and not weighted_sums.empty]
+    if not tier_sums:
+        raise ValueError(f"No match data found for {rank} on {map_name}.")
+
+    agents = sorted(set().union(*(weighted_sums.index.astype(str) for _, weighted_sums in tier_sums)))
+    feature_names = pd.Index([f"Agent_{agent}" for agent in agents])
+
+    previous_model = previous_fold_models = previous_scores = None
+    cached_model = WEIGHTED_MODEL_CACHE.get((rank, map_name))
+    if cached_model is not None and list(cached_model['feature_names']) == list(feature_names):
+        previous_model, previous_fold_models = cached_model['model'], cached_model['fold_models']
+        if cached_model['data_signature'] == data_signature:
+            previous_scores = (cached_model['regularization'], cached_model['accuracy'],
+                               cached_model['baseline_accuracy'])
+
+    model, accuracy, baseline_accuracy, fold_models = fit_weighted_model(tier_sums, agents, previous_model,
+                                                                         previous_fold_models, previous_scores)
+    WEIGHTED_MODEL_CACHE[(rank, map_name)] = {'model': model, 'accuracy': accuracy,
+                                              'baseline_accuracy': baseline_accuracy, 'regularization': model.C,
+                                              'feature_names': feature_names, 'fold_models': fold_models,
+                                              'data_signature': data_signature}
+
+    return model, accuracy, baseline_accuracy, feature_names
+
+
+# Creates the model input for a lineup: 1 for each Team 1 agent and -1 for each Team 2 agent
+def create_lineup_input(team1_agents, team2_agents, feature_names):
     input_data = pd.DataFrame(0, index=[0], columns=feature_names)
 
     for agent in team1_agents:
@@ -199,6 +558,13 @@ def predict_winner(model, team1_agents, team2_agents, feature_names):
         if agent not in team1_agents:
             input_data[f"Agent_{agent}"] = -1
 
+    return input_data
+
+
+# Predicts the winning team and returns the result as a string
+def predict_winner(model, team1_agents, team2_agents, feature_names):
+    input_data = create_lineup_input(team1_agents, team2_agents, feature_names)
+
     prediction = model.predict(input_data.values)
 
     winning_team = ''
@@ -210,6 +576,31 @@ def predict_winner(model, team1_agents, team2_agents, feature_names):
     return winning_team, input_data
 
 
+# Predicts the winning team and the win chance of each team with a matches-weighted model
+# The lineup is scored relative to an empty lineup, so only the agents decide the outcome and swapping the teams
+# mirrors the probabilities
+def predict_weighted_winner(model, team1_agents, team2_agents, feature_names):
+    unknown_agents = [agent for agent in team1_agents + team2_agents if f"Agent_{agent}" not in feature_names]
+    if unknown_agents:
+        raise ValueError(f"There is no match data for {', '.join(unknown_agents)} on this rank and map.")
+
+    lineup_input = create_lineup_input(team1_agents, team2_agents, feature_names)
+    empty_input = create_lineup_input([], [], feature_names)
+    decision = model.decision_function(lineup_input.values)[0] - model.decision_function(empty_input.values)[0]
+
+    team1_prob = 100 / (1 + np.exp(-decision))
+    team2_prob = 100 - team1_prob
+
+    if decision > 0:
+        winning_team = "Team 1 is predicted to win!"
+    elif decision < 0:
+        winning_team = "Team 2 is predicted to win!"
+    else:
+        winning_team = "Both teams are evenly matched!"
+
+    return winning_team, team1_prob, team2_prob
+
+
 # Calculates the average pick rate of the specified agent on the rank/map
 def get_pick_rate(agent_name, rank_category, map_name, team_agents):
     data = load_data(rank_category, map_name, os.path.join(EXECUTABLE_DIRECTORY, "..", "..", ))
@@ -225,18 +616,51 @@ def get_win_rate(agent_name, rank_category, map_name, team_agents):
 
 
 # Predicts the winning team based on the rank, map, and agents selected on each team
-def get_prediction(rank, map_name, team1_agents, team2_agents):
-    filtered_data = load_and_filter_data(rank, map_name, team1_agents, team2_agents)
-    features_encoded = preprocess_data(filtered_data)
-    X_train_imputed_scaled, y_train, X_test_imputed_scaled, y_test, feature_names = train_test_split_and_scaling(
-        features_encoded)
-    model, accuracy = fit_model(X_train_imputed_scaled, y_train, X_test_imputed_scaled, y_test)
-    winning_team, input_data = predict_winner(model, team1_agents, team2_agents, feature_names)
-    probs = model.predict_proba(input_data.values)
+# When weighted is set, the cached matches-weighted model of the rank/map is used instead of retraining. It is only
+# used when its held out tier accuracy beats always predicting the most common outcome
+def get_prediction(rank, map_name, team1_agents, team2_agents, weighted=False):
+    if weighted:
+        model, accuracy, baseline_accuracy, feature_names = get_weighted_model(rank, map_name)
+        if accuracy is None:
+            raise ValueError(f"{rank} on {map_name} only has a single tier of match data, so the weighted prediction "
+                             f"cannot be checked against held out data.")
+        if accuracy <= baseline_accuracy:
+            raise ValueError(f"The weighted prediction for {rank} on {map_name} is no more accurate than always "
+                             f"predicting the most common outcome.")
+
+        winning_team, team1_prob, team2_prob = predict_weighted_winner(model, team1_agents, team2_agents,
+                                                                       feature_names)
+        result_string = (f"{winning_team}\nHeld Out Tier Accuracy: {accuracy * 100:.2f}% "
+                         f"(Most Common Outcome: {baseline_accuracy * 100:.2f}%)")
+    else:
+        features_encoded = preprocess_data_chunked(
+            load_and_filter_data_chunked(rank, map_name, team1_agents, team2_agents))
+        X_train_imputed_scaled, y_train, X_test_imputed_scaled, y_test, feature_names = train_test_split_and_scaling(
+            features_encoded)
+        model, accuracy = fit_model(X_train_imputed_scaled, y_train, X_test_imputed_scaled, y_test)
+        winning_team, input_data = predict_winner(model, team1_agents, team2_agents, feature_names)
+        probs = model.predict_proba(input_data.values)
+
+        team1_prob = probs[0][1] * 100
+        team2_prob = probs[0][0] * 100
+
+        result_string = f"{winning_team}\nPrediction Accuracy: {accuracy * 100:.2f}%"
 
-    team1_prob = probs[0][1] * 100
-    team2_prob = probs[0][0] * 100
+    return result_string, team1_prob, team2_prob
 
-    result_string = f"{winning_team}\nPrediction Accuracy: {accuracy * 100:.2f}%"
 
-    return result_string, team1_prob, team2_prob
+# Predicts Team 1's win probability for the same lineup on every rank and map in a single call, using the cached
+# matches-weighted model of each pair. Returns a rank x map grid of percentages, where a pair whose data is missing or
+# cannot give a reliable weighted prediction is left as NaN
+def sweep_predictions(ranks, maps, team1_agents, team2_agents):
+    probability_grid = pd.DataFrame(index=ranks, columns=maps, dtype=float)
+
+    for rank in ranks:
+        for map_name in maps:
+            try:
+                _, team1_prob, _ = get_prediction(rank, map_name, team1_agents, team2_agents, weighted=True)
+            except (ValueError, OSError):
+                continue
+            probability_grid.loc[rank, map_name] = team1_prob
+
+    return probability_grid
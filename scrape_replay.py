@@ -0,0 +1,123 @@
+import argparse
+import os
+import random
+import time
+import zipfile
+from typing import Dict, List, Tuple
+
+import requests
+
+from data_handling import EXECUTABLE_DIRECTORY, SCRAPE_MAPS, SCRAPE_RANKS, fetch_html, scrape_rows
+
+DEFAULT_ARCHIVE = os.path.join(EXECUTABLE_DIRECTORY, "..", "..", "blitz_responses.zip")
+
+
+# Downloads every rank and map page from blitz.gg once and stores the raw responses in a compressed archive
+# Each page is also parsed while recording so a broken row selector is noticed before the archive is used
+# The archive is written to a temporary file first, so a failed recording keeps the previous archive
+def record_responses(archive_path: str, ranks: List[Tuple[str, str]], maps: List[str], fetch=fetch_html) -> int:
+    temporary_path = f"{archive_path}.tmp"
+    try:
+        with zipfile.ZipFile(temporary_path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+            def recording_fetch(url: str) -> bytes:
+                content = fetch(url)
+                archive.writestr(url, content)
+                return content
+
+            recorded_pages = 0
+            for rank_number, rank_name in ranks:
+                for map_name in maps:
+                    data_rows = scrape_rows(rank_number, map_name, recording_fetch)
+                    if not data_rows:
+                        print(f"Warning: no agent rows found for {rank_name} on {map_name}")
+                    recorded_pages += 1
+
+        os.replace(temporary_path, archive_path)
+    finally:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+
+    return recorded_pages
+
+
+# Loads the recorded responses from the archive, keyed by URL
+def load_responses(archive_path: str) -> Dict[str, bytes]:
+    with zipfile.ZipFile(archive_path) as archive:
+        return {url: archive.read(url) for url in archive.namelist()}
+
+
+# Creates a fetch function that serves recorded responses instead of contacting blitz.gg
+# Each request can be delayed to simulate network latency and fail at random to exercise the retry handling
+# A URL that was not recorded is answered with a 404 error, like a page that does not exist on blitz.gg
+def create_replay_fetch(responses: Dict[str, bytes], latency: float = 0.0, failure_rate: float = 0.0,
+                        seed: int = None, stats: Dict[str, int] = None):
+    generator = random.Random(seed)
+    if stats is None:
+        stats = {}
+    stats.setdefault("requests", 0)
+    stats.setdefault("failures", 0)
+
+    def replay_fetch(url: str) -> bytes:
+        stats["requests"] += 1
+        if latency:
+            time.sleep(latency)
+        if generator.random() < failure_rate:
+            stats["failures"] += 1
+            raise requests.ConnectionError(f"Injected failure for {url}")
+        if url not in responses:
+            response = requests.Response()
+            response.status_code = 404
+            response.url = url
+            raise requests.HTTPError(f"No recorded response for {url}", response=response)
+        return responses[url]
+
+    return replay_fetch
+
+
+# Replays the recorded responses through the scraper's parsing and row extraction and measures the throughput
+def replay_scrape(archive_path: str, ranks: List[Tuple[str, str]], maps: List[str], latency: float = 0.0,
+                  failure_rate: float = 0.0, retry_delay: float = 0.0, seed: int = None) -> Dict[str, float]:
+    responses = load_responses(archive_path)
+    stats = {"pages": 0, "rows": 0, "errors": 0}
+    fetch = create_replay_fetch(responses, latency, failure_rate, seed, stats)
+
+    start_time = time.perf_counter()
+    for rank_number, rank_name in ranks:
+        for map_name in maps:
+            try:
+                stats["rows"] += len(scrape_rows(rank_number, map_name, fetch, retry_delay))
+                stats["pages"] += 1
+            except requests.RequestException:
+                stats["errors"] += 1
+    stats["seconds"] = time.perf_counter() - start_time
+
+    return stats
+
+
+# Records or replays the blitz.gg responses from the command line and reports the replay throughput
+def main():
+    parser = argparse.ArgumentParser(description="Record blitz.gg responses once and replay them offline.")
+    parser.add_argument("mode", choices=["record", "replay"])
+    parser.add_argument("--archive", default=DEFAULT_ARCHIVE, help="Path of the compressed response archive")
+    parser.add_argument("--latency", type=float, default=0.0, help="Simulated delay per request in seconds")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Fraction of requests that fail")
+    parser.add_argument("--retry-delay", type=float, default=0.0, help="Delay before the first retry in seconds")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for the failure injection")
+    parser.add_argument("--repeat", type=int, default=1, help="Number of times to replay the archive")
+    args = parser.parse_args()
+
+    if args.mode == "record":
+        recorded_pages = record_responses(args.archive, SCRAPE_RANKS, SCRAPE_MAPS)
+        print(f"Recorded {recorded_pages} responses to {args.archive}")
+        return
+
+    for run in range(args.repeat):
+        stats = replay_scrape(args.archive, SCRAPE_RANKS, SCRAPE_MAPS, args.latency, args.failure_rate,
+                              args.retry_delay, args.seed)
+        print(f"Run {run + 1}: {stats['pages']} pages, {stats['rows']} rows, {stats['errors']} errors, "
+              f"{stats['requests']} requests ({stats['failures']} injected failures) in {stats['seconds']:.2f}s "
+              f"({stats['pages'] / stats['seconds']:.1f} pages/s)")
+
+
+if __name__ == "__main__":
+    main()
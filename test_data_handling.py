@@ -0,0 +1,243 @@
+import pytest
+
+import data_handling
+
+TEAM1_AGENTS = ['Jett', 'Sova', 'Omen', 'Killjoy', 'Raze']
+TEAM2_AGENTS = ['Reyna', 'Sage', 'Brimstone', 'Cypher', 'Phoenix']
+
+
+@pytest.mark.parametrize("rank, map_name", [("Iron", "Bind"), ("Gold", "Ascent"), ("Immortal", "Split")])
+def test_weighted_prediction_mirrors_when_teams_are_swapped(rank, map_name):
+    _, team1_prob, team2_prob = data_handling.get_prediction(rank, map_name, TEAM1_AGENTS, TEAM2_AGENTS,
+                                                             weighted=True)
+    _, swapped_team1_prob, swapped_team2_prob = data_handling.get_prediction(rank, map_name, TEAM2_AGENTS,
+                                                                             TEAM1_AGENTS, weighted=True)
+
+    assert team1_prob == pytest.approx(swapped_team2_prob)
+    assert team2_prob == pytest.approx(swapped_team1_prob)
+
+
+def test_weighted_prediction_of_empty_lineup_is_even():
+    _, team1_prob, team2_prob = data_handling.get_prediction("Iron", "Bind", [], [], weighted=True)
+
+    assert team1_prob == pytest.approx(50)
+    assert team2_prob == pytest.approx(50)
+
+
+def test_weighted_prediction_of_mirrored_lineup_is_an_even_match():
+    winning_team, team1_prob, team2_prob = data_handling.get_prediction("Gold", "Ascent", ['Jett'], ['Jett'],
+                                                                        weighted=True)
+
+    assert winning_team.startswith("Both teams are evenly matched!")
+    assert team1_prob == pytest.approx(50)
+    assert team2_prob == pytest.approx(50)
+
+
+def test_weighted_model_beats_most_common_outcome_on_held_out_tiers():
+    _, accuracy, baseline_accuracy, _ = data_handling.get_weighted_model("Gold", "Ascent")
+
+    assert accuracy > baseline_accuracy
+
+
+@pytest.mark.parametrize("rank, map_name, message", [("Radiant", "Haven", "single tier"),
+                                                     ("Immortal", "Haven", "most common outcome")])
+def test_weighted_prediction_is_refused_when_it_cannot_be_checked_or_does_not_beat_baseline(rank, map_name, message):
+    with pytest.raises(ValueError, match=message):
+        data_handling.get_prediction(rank, map_name, TEAM1_AGENTS, TEAM2_AGENTS, weighted=True)
+
+
+def test_refit_does_not_modify_cached_model():
+    data_handling.refit_weighted_model("Gold", "Ascent")
+    cached_model = data_handling.WEIGHTED_MODEL_CACHE[("Gold", "Ascent")]['model']
+    cached_coefficients = cached_model.coef_.copy()
+
+    data_handling.refit_weighted_model("Gold", "Ascent")
+
+    assert (cached_model.coef_ == cached_coefficients).all()
+    assert data_handling.WEIGHTED_MODEL_CACHE[("Gold", "Ascent")]['model'] is not cached_model
+
+
+def test_refit_with_unchanged_data_reuses_held_out_scores(monkeypatch):
+    data_handling.get_weighted_model("Gold", "Ascent")
+    monkeypatch.setattr(data_handling, "score_weighted_model",
+                        lambda *args: pytest.fail("held out tiers were scored again"))
+
+    _, accuracy, _, _ = data_handling.refit_weighted_model("Gold", "Ascent")
+
+    assert accuracy == data_handling.WEIGHTED_MODEL_CACHE[("Gold", "Ascent")]['accuracy']
+
+
+def test_sweep_predictions_mirror_when_teams_are_swapped():
+    probability_grid = data_handling.sweep_predictions(data_handling.COMPETITIVE_RANKS, data_handling.SCRAPE_MAPS,
+                                                       TEAM1_AGENTS, TEAM2_AGENTS)
+    swapped_probability_grid = data_handling.sweep_predictions(data_handling.COMPETITIVE_RANKS,
+                                                               data_handling.SCRAPE_MAPS, TEAM2_AGENTS, TEAM1_AGENTS)
+
+    assert list(probability_grid.index) == data_handling.COMPETITIVE_RANKS
+    assert list(probability_grid.columns) == data_handling.SCRAPE_MAPS
+    assert probability_grid.loc["Radiant"].isna().all()
+    assert (probability_grid.isna() == swapped_probability_grid.isna()).all().all()
+    predicted = probability_grid.notna().values
+    assert (probability_grid.values + swapped_probability_grid.values)[predicted] == pytest.approx(100)
+
+
+def test_sweep_predictions_leave_failing_pairs_as_nan(monkeypatch):
+    get_prediction = data_handling.get_prediction
+
+    def failing_get_prediction(rank, map_name, team1_agents, team2_agents, weighted=False):
+        if (rank, map_name) == ("Gold", "Ascent"):
+            raise ValueError("Found array with 0 sample(s)")
+        return get_prediction(rank, map_name, team1_agents, team2_agents, weighted)
+
+    monkeypatch.setattr(data_handling, "get_prediction", failing_get_prediction)
+    probability_grid = data_handling.sweep_predictions(["Gold"], ["Ascent", "Bind"], TEAM1_AGENTS, TEAM2_AGENTS)
+
+    assert probability_grid.isna().loc["Gold"].tolist() == [True, False]
+
+
+def test_chunked_preprocessing_matches_in_memory_preprocessing():
+    processed_data = data_handling.preprocess_data(
+        data_handling.load_and_filter_data("Gold", "Ascent", TEAM1_AGENTS, TEAM2_AGENTS))
+    chunked_processed_data = data_handling.preprocess_data_chunked(
+        data_handling.load_and_filter_data_chunked("Gold", "Ascent", TEAM1_AGENTS, TEAM2_AGENTS, chunksize=7))
+
+    assert list(chunked_processed_data.columns) == list(processed_data.columns)
+    assert chunked_processed_data.values.astype(float) == pytest.approx(processed_data.values.astype(float), rel=1e-6)
+
+
+def test_chunked_preprocessing_of_all_agents_has_consistent_columns():
+    data_file = data_handling.os.path.join(data_handling.EXECUTABLE_DIRECTORY, "..", "..", "CompetitiveData", "Gold",
+                                           "Ascent", "Gold_Ascent_CombinedData.csv")
+    processed_data = data_handling.preprocess_data_chunked(data_handling.read_filtered_chunks(data_file, chunksize=7))
+
+    agent_columns = [column for column in processed_data.columns if column.startswith('Agent_')]
+    file_agents = sorted(data_handling.pd.read_csv(data_file)['Agent'].unique())
+    assert agent_columns == [f"Agent_{agent}" for agent in file_agents]
+    assert not processed_data.isna().any().any()
+    assert (processed_data[agent_columns].dtypes == bool).all()
+    assert (processed_data[agent_columns].sum(axis=1) == 1).all()
+
+
+def test_chunked_aggregation_matches_in_memory_aggregation():
+    data_file = data_handling.os.path.join(data_handling.EXECUTABLE_DIRECTORY, "..", "..", "CompetitiveData", "Gold",
+                                           "Ascent", "Gold_Ascent_CombinedData.csv")
+    aggregated_data = data_handling.aggregate_tier_data(data_handling.pd.read_csv(data_file))
+    chunked_aggregated_data = data_handling.aggregate_tier_data_chunked(data_file, chunksize=7)
+
+    assert list(chunked_aggregated_data['Agent']) == list(aggregated_data['Agent'])
+    assert (chunked_aggregated_data['Matches'] == aggregated_data['Matches']).all()
+    assert chunked_aggregated_data[data_handling.STAT_COLUMNS].values == pytest.approx(
+        aggregated_data[data_handling.STAT_COLUMNS].values, rel=1e-6)
+
+
+DATA_HEADER = "Rank,Agent,Kills,Deaths,Assists,Win %,Pick %,Avg. Score,First Blood %,Matches\n"
+
+
+def test_chunked_aggregation_keeps_agents_that_are_not_listed(tmp_path):
+    data_file = tmp_path / "gold1_ascent.csv"
+    data_file.write_text(DATA_HEADER + "1,Clove,15.0,14.0,6.0,0.52,0.05,210,0.1,400\n"
+                                       "2,Jett,17.0,15.0,3.0,0.48,0.2,230,0.2,600\n")
+
+    aggregated_data = data_handling.aggregate_tier_data_chunked(str(data_file), chunksize=1)
+
+    assert "Clove" not in data_handling.AGENTS
+    assert list(aggregated_data['Agent']) == ["Clove", "Jett"]
+
+
+def test_chunked_functions_report_header_only_files(tmp_path):
+    data_file = tmp_path / "gold1_ascent.csv"
+    data_file.write_text(DATA_HEADER)
+
+    assert list(data_handling.read_filtered_chunks(str(data_file), TEAM1_AGENTS)) == []
+    with pytest.raises(ValueError, match="No match data found"):
+        data_handling.preprocess_data_chunked(data_handling.read_filtered_chunks(str(data_file), TEAM1_AGENTS))
+    with pytest.raises(ValueError, match="No match data found"):
+        data_handling.aggregate_tier_data_chunked(str(data_file))
+
+
+def test_chunked_loading_output_can_be_preprocessed_in_memory():
+    filtered_data = data_handling.pd.concat(
+        data_handling.load_and_filter_data_chunked("Gold", "Ascent", TEAM1_AGENTS, TEAM2_AGENTS, chunksize=7))
+    processed_data = data_handling.preprocess_data(filtered_data)
+
+    assert len(processed_data) == len(data_handling.load_and_filter_data("Gold", "Ascent", TEAM1_AGENTS, TEAM2_AGENTS))
+
+
+def create_failing_fetch(error, failures):
+    attempts = []
+
+    def failing_fetch(url):
+        attempts.append(url)
+        if len(attempts) <= failures:
+            raise error
+        return b"<html></html>"
+
+    return failing_fetch, attempts
+
+
+def create_http_error(status_code):
+    response = data_handling.requests.Response()
+    response.status_code = status_code
+    return data_handling.requests.HTTPError(response=response)
+
+
+@pytest.mark.parametrize("error", [data_handling.requests.ConnectionError(), data_handling.requests.Timeout(),
+                                   create_http_error(503)])
+def test_parse_html_retries_transient_failures(error):
+    fetch, attempts = create_failing_fetch(error, failures=2)
+
+    data_handling.parse_html("https://blitz.gg", fetch, retry_delay=0)
+
+    assert len(attempts) == 3
+
+
+def test_parse_html_does_not_retry_client_errors():
+    fetch, attempts = create_failing_fetch(create_http_error(404), failures=1)
+
+    with pytest.raises(data_handling.requests.HTTPError):
+        data_handling.parse_html("https://blitz.gg", fetch, retry_delay=0)
+
+    assert len(attempts) == 1
+
+
+def test_fetch_html_times_out(monkeypatch):
+    request_timeouts = []
+
+    def stub_get(url, timeout=None):
+        request_timeouts.append(timeout)
+        response = data_handling.requests.Response()
+        response.status_code = 200
+        response._content = b"<html></html>"
+        return response
+
+    monkeypatch.setattr(data_handling.requests, "get", stub_get)
+
+    data_handling.fetch_html("https://blitz.gg")
+
+    assert request_timeouts == [data_handling.REQUEST_TIMEOUT]
+
+
+def test_scrape_data_skips_failed_pages_and_continues(monkeypatch):
+    written_files = {}
+    monkeypatch.setattr(data_handling, "write_to_csv",
+                        lambda file_path, header, rows: written_files.update({file_path: rows}))
+    fetch, _ = create_failing_fetch(create_http_error(404), failures=1)
+
+    failed_pages = data_handling.scrape_data([(3, "Iron 1")], ["Split", "Ascent"], fetch)
+
+    assert failed_pages == ["Iron 1 on Split"]
+    assert written_files == {"iron1_ascent.csv": []}
+
+
+def test_organize_data_files_keeps_tiers_that_were_not_downloaded_again(tmp_path):
+    map_directory = tmp_path / "CompetitiveData" / "Gold" / "Ascent"
+    map_directory.mkdir(parents=True)
+    (map_directory / "gold1_ascent.csv").write_text(DATA_HEADER + "1,Jett,17.0,15.0,3.0,0.48,0.2,230,0.2,600\n")
+    (tmp_path / "gold2_ascent.csv").write_text(DATA_HEADER + "1,Sova,15.0,14.0,6.0,0.52,0.05,210,0.1,400\n")
+
+    data_handling.organize_data_files(str(tmp_path))
+
+    combined_data = data_handling.pd.read_csv(map_directory / "Gold_Ascent_CombinedData.csv")
+    assert list(combined_data['Agent']) == ["Jett", "Sova"]
+    assert not (tmp_path / "gold2_ascent.csv").exists()
+    assert not (tmp_path / "CompetitiveData" / "Gold" / "Split" / "Gold_Split_CombinedData.csv").exists()
@@ -0,0 +1,66 @@
+import pytest
+
+import data_handling
+import scrape_replay
+
+RANKS = [(12, "Gold 1")]
+MAPS = ["Split", "Ascent"]
+
+
+def create_page(agents):
+    rows = "".join(f"<div><div>{rank}</div><div>{agent}</div><div></div><div>15.2 / 14.1 / 6.3</div><div></div>"
+                   f"<div>51.2%</div><div>4.5%</div><div>212</div><div>12.5%</div><div>1,234</div></div>"
+                   for rank, agent in enumerate(agents, start=1))
+    return ('<div id="main-content"><div><div class="⚡de27659b inner-wrapper-col"><div><div></div><div></div>'
+            '<div></div><div><section><div><div class="⚡e728021b ⚡197afe09"><div><div class="⚡516a5f38"><div>'
+            f'{rows}</div></div></div></div></div></section></div></div></div></div></div>').encode()
+
+
+def create_stub_fetch(agents):
+    fetched_urls = []
+
+    def stub_fetch(url):
+        fetched_urls.append(url)
+        return create_page(agents)
+
+    return stub_fetch, fetched_urls
+
+
+def test_record_and_replay_round_trip(tmp_path):
+    archive_path = str(tmp_path / "responses.zip")
+    fetch, fetched_urls = create_stub_fetch(["Jett", "Sova", "Omen"])
+
+    recorded_pages = scrape_replay.record_responses(archive_path, RANKS, MAPS, fetch)
+    stats = scrape_replay.replay_scrape(archive_path, RANKS, MAPS, seed=0)
+
+    assert recorded_pages == 2
+    assert sorted(scrape_replay.load_responses(archive_path)) == sorted(fetched_urls)
+    assert (stats["pages"], stats["rows"], stats["errors"], stats["requests"]) == (2, 6, 0, 2)
+
+
+def test_replay_counts_unrecorded_pages_as_errors(tmp_path):
+    archive_path = str(tmp_path / "responses.zip")
+    fetch, _ = create_stub_fetch(["Jett"])
+    scrape_replay.record_responses(archive_path, RANKS, MAPS, fetch)
+
+    stats = scrape_replay.replay_scrape(archive_path, RANKS, MAPS + ["Haven"], seed=0)
+
+    assert (stats["pages"], stats["errors"], stats["requests"]) == (2, 1, 3)
+
+
+def test_failed_recording_keeps_previous_archive(tmp_path):
+    archive_path = str(tmp_path / "responses.zip")
+    fetch, _ = create_stub_fetch(["Jett"])
+    scrape_replay.record_responses(archive_path, RANKS, MAPS, fetch)
+    responses = scrape_replay.load_responses(archive_path)
+
+    def failing_fetch(url):
+        response = data_handling.requests.Response()
+        response.status_code = 404
+        raise data_handling.requests.HTTPError(response=response)
+
+    with pytest.raises(data_handling.requests.HTTPError):
+        scrape_replay.record_responses(archive_path, RANKS, MAPS, failing_fetch)
+
+    assert scrape_replay.load_responses(archive_path) == responses
+    assert list(tmp_path.iterdir()) == [tmp_path / "responses.zip"]